@@ -1,10 +1,20 @@
 # Re-import everything after reset
+"""PySupervisor: manage inline TODO lists inside Python files.
+
+Every hot path here is string searching and file I/O, so the module stays plain Python with no
+C extensions or Numba (which falls back to object mode on this kind of code). For large
+repositories, run it under PyPy instead: pypy3 todo_cli.py scan --path <project>
+"""
+import mmap
+import operator
 import os
 import re
+import sys
 from pathlib import Path
 import typer
-from typing import List
-from datetime import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
 from typing import Optional
 
 app = typer.Typer()
@@ -12,27 +22,254 @@ app = typer.Typer()
 TODO_START = "''' <---TODO LIST - START--->"
 TODO_END = "<---TODO LIST - END--->'''"
 
-def find_python_files(root: Path) -> List[Path]:
-    return [p for p in root.rglob("*.py") if p.is_file()]
+_START_B = TODO_START.encode()
+_END_B = TODO_END.encode()
+_LEN_START = len(_START_B)
+_LEN_END = len(_END_B)
+# Files smaller than this cannot hold both markers, so they never need to be read
+_MIN_BLOCK_SIZE = _LEN_START + _LEN_END
+_EMPTY_BLOCK_B = f"\n{TODO_START}\n{TODO_END}\n".encode()
+_TAIL_WINDOW = 8192
+# Without this, os.open on Windows translates newlines and stops reading at a 0x1A byte
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+_DUE_RE = re.compile(r"Due:\s*(\d{4}-\d{2}-\d{2})")
+_ASSIGNED_RE = re.compile(r"Assigned:\s*(\w+)")
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}\Z")
+
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+def _scandir_py(root: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_symlink():
+                    continue
+                if entry.is_file(follow_symlinks=False) and entry.name.endswith(".py"):
+                    yield entry
+                elif entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_py(entry.path)
+    except PermissionError:
+        return
+
+def iter_python_files(root: Path) -> Iterator[os.DirEntry]:
+    return _scandir_py(os.fspath(root))
+
+def _map_ordered(fn, items):
+    # Keeps a bounded window of in-flight work so results stream out while the tree is still being walked.
+    # Yields (item, result, error) in submission order; a failing file is handed back as its error
+    # so every file a worker has touched still gets reported
+    def take():
+        item, future = pending.popleft()
+        try:
+            return item, future.result(), None
+        except Exception as exc:
+            return item, None, exc
+
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as ex:
+        pending = deque()
+        try:
+            for item in items:
+                pending.append((item, ex.submit(fn, item)))
+                if len(pending) >= _MAX_WORKERS * 2:
+                    yield take()
+            while pending:
+                yield take()
+        except BaseException:
+            # Don't let queued files be processed (and possibly rewritten) after a failure
+            for _, future in pending:
+                future.cancel()
+            raise
+
+def _read_fd(fd: int) -> bytes:
+    size = os.fstat(fd).st_size
+    chunks = []
+    while True:
+        chunk = os.read(fd, max(size, 1 << 16))
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+def _read_bytes(file_path: Path) -> bytes:
+    fd = os.open(file_path, os.O_RDONLY | _O_BINARY)
+    try:
+        return _read_fd(fd)
+    finally:
+        os.close(fd)
 
-def parse_todo_block(text: str) -> List[str] | None:
-    pattern = re.compile(
-        rf"{re.escape(TODO_START)}(.*?){re.escape(TODO_END)}",
-        re.DOTALL,
-    )
-    match = pattern.search(text)
-    if not match:
+def _write_bytes(file_path: Path, data: bytes) -> None:
+    fd = os.open(file_path, os.O_WRONLY | os.O_TRUNC | _O_BINARY)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+def _read_tail_fd(fd: int, window: int = _TAIL_WINDOW) -> tuple[bytes, tuple[int, int] | None]:
+    # TODO blocks get appended at the end of the file, so the last few KiB usually hold the
+    # whole block; only when they don't is the full file read. The span is handed back with the
+    # buffer so callers never search it a second time
+    size = os.fstat(fd).st_size
+    if size > window:
+        os.lseek(fd, size - window, os.SEEK_SET)
+        tail = os.read(fd, window)
+        span = _find_block(tail)
+        if span is not None:
+            return tail, span
+        os.lseek(fd, 0, os.SEEK_SET)
+    buf = _read_fd(fd)
+    return buf, _find_block(buf)
+
+def _read_tail(file_path: Path, window: int = _TAIL_WINDOW) -> tuple[bytes, tuple[int, int] | None]:
+    fd = os.open(file_path, os.O_RDONLY | _O_BINARY)
+    try:
+        return _read_tail_fd(fd, window)
+    finally:
+        os.close(fd)
+
+def _mmap_todo_block(file_path: Path) -> List[str] | None:
+    fd = os.open(file_path, os.O_RDONLY | _O_BINARY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return None
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return _decode_block(*_read_tail_fd(fd))
+        with mm:
+            return _decode_block(mm, _find_block(mm))
+    finally:
+        os.close(fd)
+
+def _find_block(data) -> tuple[int, int] | None:
+    # Every command works on the last block in the file: blocks are appended at the end, and it
+    # is the only one the tail read in scan can locate without reading the whole file
+    j = data.rfind(_END_B)
+    if j < 0:
+        return None
+    i = data.rfind(_START_B, 0, j)
+    if i < 0:
         return None
-    content = match.group(1).strip()
-    return content.splitlines() if content else []
+    return i + _LEN_START, j
+
+def _splice_block(data: bytes, span: tuple[int, int], body: bytes) -> bytes:
+    return data[:span[0]] + body + data[span[1]:]
+
+def _newline_of(data: bytes, span: tuple[int, int] | None = None) -> bytes:
+    # Follow the block's own line endings, falling back to the file's when there is no block
+    # or it has no lines
+    k = data.find(b"\n", span[0], span[1]) if span else -1
+    if k < 0:
+        k = data.find(b"\n")
+    return b"\r\n" if k > 0 and data[k - 1:k] == b"\r" else b"\n"
+
+def _decode_block(data, span: tuple[int, int] | None) -> List[str] | None:
+    if span is None:
+        return None
+    return _block_lines(data[span[0]:span[1]].decode("utf-8"))
+
+def _block_lines(content: str) -> List[str]:
+    return [line for line in content.splitlines() if line.strip()]
+
+def _strip_blocks(data: bytes) -> bytes:
+    # A CRLF pair around a block counts as one newline, just like a bare LF
+    floor = 0
+    i = data.find(_START_B)
+    while i >= 0:
+        j = data.find(_END_B, i + _LEN_START)
+        if j < 0:
+            break
+        cut = i
+        if data.endswith(b"\r\n", floor, i):
+            cut -= 2
+        elif data.endswith(b"\n", floor, i):
+            cut -= 1
+        stop = j + _LEN_END
+        if data.startswith(b"\r\n", stop):
+            stop += 2
+        elif data.startswith(b"\n", stop):
+            stop += 1
+        data = data[:cut] + data[stop:]
+        floor = cut
+        i = data.find(_START_B, cut)
+    return data
 
-def ensure_todo_block(file_path: Path) -> bool:
-    text = file_path.read_text(encoding="utf-8")
-    if TODO_START in text and TODO_END in text:
+def _load_and_ensure(file_path: Path) -> tuple[bytes, bool]:
+    fd = os.open(file_path, os.O_RDWR | _O_BINARY)
+    try:
+        buf = _read_fd(fd)
+        if _START_B in buf and _END_B in buf:
+            return buf, False
+        os.write(fd, _EMPTY_BLOCK_B)
+        return buf + _EMPTY_BLOCK_B, True
+    finally:
+        os.close(fd)
+
+def _append_empty_block(file_path: Path) -> None:
+    fd = os.open(file_path, os.O_WRONLY | os.O_APPEND | _O_BINARY)
+    try:
+        os.write(fd, _EMPTY_BLOCK_B)
+    finally:
+        os.close(fd)
+
+def _scan_one(entry: os.DirEntry) -> tuple[Path, bool, List[str] | None]:
+    file = Path(entry.path)
+    if entry.stat(follow_symlinks=False).st_size < _MIN_BLOCK_SIZE:
+        _append_empty_block(file)
+        return file, True, []
+    buf, span = _read_tail(file)
+    if _START_B in buf and _END_B in buf:
+        return file, False, _decode_block(buf, span)
+    _append_empty_block(file)
+    return file, True, []
+
+def _list_one(entry: os.DirEntry) -> tuple[Path, List[str] | None]:
+    file = Path(entry.path)
+    if entry.stat(follow_symlinks=False).st_size < _MIN_BLOCK_SIZE:
+        return file, None
+    return file, _mmap_todo_block(file)
+
+def _clean_one(entry: os.DirEntry) -> tuple[Path, bool]:
+    file = Path(entry.path)
+    if entry.stat(follow_symlinks=False).st_size < _MIN_BLOCK_SIZE:
+        return file, False
+    buf = _read_bytes(file)
+    if _find_block(buf) is None:
+        return file, False
+    _write_bytes(file, _strip_blocks(buf))
+    return file, True
+
+def _renumber(todo: str, new_id: int) -> str:
+    rp = todo.find(")")
+    if rp < 2 or todo[0] != "(" or not todo[1:rp].isdecimal():
+        return todo
+    return f"({new_id}){todo[rp + 1:]}"
+
+def extract_due(todo: str) -> str:
+    match = _DUE_RE.search(todo)
+    return match.group(1) if match else "9999-12-31"
+
+def extract_assigned(todo: str) -> str:
+    match = _ASSIGNED_RE.search(todo)
+    return match.group(1).lower() if match else ""
+
+def _decorated_sort(todos: List[str], key, reverse: bool = False) -> List[str]:
+    decorated = [(key(todo), todo) for todo in todos]
+    decorated.sort(key=operator.itemgetter(0), reverse=reverse)
+    return [todo for _, todo in decorated]
+
+def _is_valid_date(due: str) -> bool:
+    if not _DATE_RE.match(due):
         return False
-    with file_path.open("a", encoding="utf-8") as f:
-        f.write(f"\n{TODO_START}\n{TODO_END}\n")
-    return True
+    y, m, d = int(due[0:4]), int(due[5:7]), int(due[8:10])
+    if y < 1 or not 1 <= m <= 12:
+        return False
+    leap = m == 2 and y % 4 == 0 and (y % 100 != 0 or y % 400 == 0)
+    return 1 <= d <= _DAYS_IN_MONTH[m - 1] + leap
 
 def format_priority(level: int | None) -> str:
     priorities = {1: "LOW", 2: "MEDIUM", 3: "HIGH", 4: "URGENT"}
@@ -44,11 +281,9 @@ def build_task_line(index: int, task: str, priority: int | None, due: str | None
         parts.append(format_priority(priority))
     parts.append(task)
     if due:
-        try:
-            datetime.strptime(due, "%Y-%m-%d")
-            parts.append(f"Due: {due}")
-        except ValueError:
+        if not _is_valid_date(due):
             raise typer.BadParameter("Due date must be in YYYY-MM-DD format")
+        parts.append(f"Due: {due}")
     if assigned:
         parts.append(f"Assigned: {assigned}")
     return " ".join(parts)
@@ -56,21 +291,28 @@ def build_task_line(index: int, task: str, priority: int | None, due: str | None
 @app.command()
 def scan(path: Path = typer.Option(..., help="Project root directory")):
     """Runs a scan for the TODO blocks across all Python files in the particular directory passed. If the TODO blocks are not present, they will be added automatically."""
-    files = find_python_files(path)
-    for file in files:
-        added = ensure_todo_block(file)
-        text = file.read_text(encoding="utf-8")
-        todos = parse_todo_block(text)
+    if not path.is_dir():
+        typer.echo(f"❌ Directory not found: {path}")
+        raise typer.Exit(code=1)
 
+    failed = False
+    for entry, result, error in _map_ordered(_scan_one, iter_python_files(path)):
+        if error is not None:
+            typer.echo(f"[{entry.path}] ❌ {error}")
+            failed = True
+            continue
+        file, added, todos = result
         if added:
-            typer.echo(f"[{file}] ✅ Initialized TODO block (no tasks yet)\n")
+            sys.stdout.write(f"[{file}] ✅ Initialized TODO block (no tasks yet)\n\n")
         elif todos:
-            typer.echo(f"[{file}]")
-            for todo in todos:
-                typer.echo(f"  {todo}")
-            typer.echo("")
+            out = [f"[{file}]\n"]
+            out.extend(f"  {todo}\n" for todo in todos)
+            out.append("\n")
+            sys.stdout.write("".join(out))
         else:
-            typer.echo(f"[{file}] 🚫 TODO block is empty\n")
+            sys.stdout.write(f"[{file}] 🚫 TODO block is empty\n\n")
+    if failed:
+        raise typer.Exit(code=1)
 
 @app.command()
 def list(
@@ -87,7 +329,10 @@ def list(
     (7) Assigned Name: A-Z Order -> a-z_assignedname,
     (8) Assigned Name: Z-A Order -> z-a_assignedname
     """
-    files = find_python_files(path)
+    if not path.is_dir():
+        typer.echo(f"❌ Directory not found: {path}")
+        raise typer.Exit(code=1)
+
     sort_options = {
         "ascending_id", "descending_id", "a-z", "z-a",
         "ascending_due_date", "descending_due_date",
@@ -98,58 +343,61 @@ def list(
         typer.echo(f"❌ Invalid sort option. Use one of: {', '.join(sorted(sort_options))}")
         raise typer.Exit(code=1)
 
-    def extract_due(todo: str) -> str:
-        match = re.search(r"Due:\s*(\d{4}-\d{2}-\d{2})", todo)
-        return match.group(1) if match else "9999-12-31"
-
-    def extract_assigned(todo: str) -> str:
-        match = re.search(r"Assigned:\s*(\w+)", todo)
-        return match.group(1).lower() if match else ""
-
-    for file in files:
-        text = file.read_text(encoding="utf-8")
-        todos = parse_todo_block(text)
-        typer.echo(f"📄 {file}")
+    failed = False
+    for entry, result, error in _map_ordered(_list_one, iter_python_files(path)):
+        if error is not None:
+            typer.echo(f"[{entry.path}] ❌ {error}")
+            failed = True
+            continue
+        file, todos = result
+        if todos is None:
+            continue
+        out = [f"📄 {file}\n"]
 
         if todos:
             if sort == "ascending_id":
                 todos = todos
             elif sort == "descending_id":
-                todos = list(reversed(todos))
+                todos = todos[::-1]
             elif sort == "a-z":
-                todos = sorted(todos, key=lambda x: x.lower())
+                todos = _decorated_sort(todos, str.lower)
             elif sort == "z-a":
-                todos = sorted(todos, key=lambda x: x.lower(), reverse=True)
+                todos = _decorated_sort(todos, str.lower, reverse=True)
             elif sort == "ascending_due_date":
-                todos = sorted(todos, key=extract_due)
+                todos = _decorated_sort(todos, extract_due)
             elif sort == "descending_due_date":
-                todos = sorted(todos, key=extract_due, reverse=True)
+                todos = _decorated_sort(todos, extract_due, reverse=True)
             elif sort == "a-z_assignedname":
-                todos = sorted(todos, key=extract_assigned)
+                todos = _decorated_sort(todos, extract_assigned)
             elif sort == "z-a_assignedname":
-                todos = sorted(todos, key=extract_assigned, reverse=True)
+                todos = _decorated_sort(todos, extract_assigned, reverse=True)
 
-            for i, todo in enumerate(todos):
-                typer.echo(f"  [{i}] {todo}")
+            out.extend(f"  [{i}] {todo}\n" for i, todo in enumerate(todos))
         else:
-            typer.echo("  [EMPTY TODO SECTION]")
-        typer.echo("")
+            out.append("  [EMPTY TODO SECTION]\n")
+        out.append("\n")
+        sys.stdout.write("".join(out))
+    if failed:
+        raise typer.Exit(code=1)
 
 @app.command()
 def clean(path: Path = typer.Option(..., help="Project root directory")):
     """Removes all TODO blocks present in a particular directory for a production build. While leaving TODO blocks present will not impact performance, it would make the code look cleaner."""
-    files = find_python_files(path)
-    for file in files:
-        text = file.read_text(encoding="utf-8")
-        if TODO_START in text and TODO_END in text:
-            new_text = re.sub(
-                rf"\n?{re.escape(TODO_START)}.*?{re.escape(TODO_END)}\n?",
-                "",
-                text,
-                flags=re.DOTALL,
-            )
-            file.write_text(new_text, encoding="utf-8")
-            typer.echo(f"[{file}] 🧹 Removed TODO block")
+    if not path.is_dir():
+        typer.echo(f"❌ Directory not found: {path}")
+        raise typer.Exit(code=1)
+
+    failed = False
+    for entry, result, error in _map_ordered(_clean_one, iter_python_files(path)):
+        if error is not None:
+            typer.echo(f"[{entry.path}] ❌ {error}")
+            failed = True
+            continue
+        file, removed = result
+        if removed:
+            sys.stdout.write(f"[{file}] 🧹 Removed TODO block\n")
+    if failed:
+        raise typer.Exit(code=1)
 
 @app.command()
 def add(
@@ -164,27 +412,23 @@ def add(
         typer.echo(f"❌ File not found: {file}")
         raise typer.Exit(code=1)
 
-    added = ensure_todo_block(file)
-
-    content = file.read_text(encoding="utf-8")
-    todos = parse_todo_block(content) or []
+    buf, _ = _load_and_ensure(file)
+    span = _find_block(buf)
+    todos = _decode_block(buf, span) or []
 
     new_index = len(todos) + 1
     new_task_line = build_task_line(new_index, task, priority, due, assigned)
-    todos.append(new_task_line)
-
-    new_block = f"{TODO_START}\n" + "\n".join(todos) + f"\n{TODO_END}"
-    if TODO_START in content and TODO_END in content:
-        content = re.sub(
-            rf"{re.escape(TODO_START)}.*?{re.escape(TODO_END)}",
-            new_block,
-            content,
-            flags=re.DOTALL,
-        )
+
+    nl = _newline_of(buf, span)
+    if span:
+        # Splice the new line in just before the end marker instead of rebuilding the block
+        j = span[1]
+        sep = b"" if buf[j - 1:j] == b"\n" else nl
+        buf = _splice_block(buf, (j, j), sep + new_task_line.encode() + nl)
     else:
-        content += "\n" + new_block
+        buf += nl + _START_B + nl + new_task_line.encode() + nl + _END_B + nl
 
-    file.write_text(content, encoding="utf-8")
+    _write_bytes(file, buf)
     typer.echo(f"✅ Task added to {file}:\n  {new_task_line}")
 
 @app.command()
@@ -197,8 +441,9 @@ def complete(
         typer.echo(f"❌ File not found: {file}")
         raise typer.Exit(code=1)
 
-    content = file.read_text(encoding="utf-8")
-    todos = parse_todo_block(content)
+    buf = _read_bytes(file)
+    span = _find_block(buf)
+    todos = _decode_block(buf, span)
 
     if not todos:
         typer.echo("⚠️ No TODOs found in file.")
@@ -210,16 +455,11 @@ def complete(
 
     removed = todos.pop(id)
     # Re-number tasks
-    updated_todos = [re.sub(r"^\(\d+\)", f"({i+1})", todo) for i, todo in enumerate(todos)]
-    new_block = f"{TODO_START}\n" + "\n".join(updated_todos) + f"\n{TODO_END}"
-
-    content = re.sub(
-        rf"{re.escape(TODO_START)}.*?{re.escape(TODO_END)}",
-        new_block,
-        content,
-        flags=re.DOTALL,
-    )
-    file.write_text(content, encoding="utf-8")
+    updated_todos = [_renumber(todo, i + 1) for i, todo in enumerate(todos)]
+    nl = _newline_of(buf, span)
+    new_body = nl + nl.join(todo.encode() for todo in updated_todos) + nl
+
+    _write_bytes(file, _splice_block(buf, span, new_body))
     typer.echo(f"✅ Removed task ID {id}: {removed.strip()}")
 
 if __name__ == "__main__":